@@ -1,14 +1,83 @@
 import asyncio
 import websockets
-import json
+import msgspec
 import logging
+import heapq
+import time
+import zlib
 from datetime import datetime
-from typing import Dict, Set, Any
+from typing import Dict, Set, Any, Optional
 import firebase_admin
 from firebase_admin import auth, credentials
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, asdict
+from concurrent.futures import ThreadPoolExecutor
 import secrets
 
+# Codificador/decodificador JSON (msgspec es mucho más rápido que el módulo json
+# estándar y devuelve bytes directamente, que websockets acepta sin conversión)
+_ENC = msgspec.json.Encoder()
+_DEC = msgspec.json.Decoder()
+
+# MessagePack para los mensajes de alta frecuencia (ROOM_UPDATE / PLAYER_UPDATE):
+# ~3x más rápido que JSON y payloads ~25% más chicos en registros numéricos.
+# Los mensajes poco frecuentes (WELCOME, chat, errores) siguen en JSON para
+# poder depurarlos a simple vista. El cliente decodifica los frames binarios
+# con @msgpack/msgpack y puede enviar sus PLAYER_UPDATE también en binario.
+_MP_ENC = msgspec.msgpack.Encoder()
+_MP_DEC = msgspec.msgpack.Decoder()
+
+# Campos de PlayerState que viajan en los PLAYER_UPDATE / ROOM_DELTA
+_WIRE_FIELDS = (
+    "x",
+    "y",
+    "hp",
+    "score",
+    "angle",
+    "flags",
+)
+
+# Mensajes pendientes que toleramos por cliente antes de descartar los viejos:
+# un cliente lento solo atrasa su propia cola, nunca el broadcast de los demás
+OUT_QUEUE_SIZE = 64
+
+# Los broadcasts de sala se comprimen UNA vez para todos los clientes (en vez
+# del permessage-deflate por conexión, que queda deshabilitado). El primer
+# byte del frame indica el formato: 0x00 msgpack crudo, 0x01 msgpack + zlib.
+# Los frames JSON no llevan prefijo (empiezan con '{', inconfundible).
+FRAME_RAW = b"\x00"
+FRAME_DEFLATE = b"\x01"
+COMPRESS_MIN_SIZE = 512  # bytes; por debajo no amortiza el zlib
+
+
+def _coalesce(batch):
+    """Fusiona mensajes encolados consecutivos del mismo formato en un BATCH.
+
+    Cada elemento es (fmt, payload) con fmt en "json", "msgpack" o "frame".
+    Un mensaje solo sale tal cual; varios seguidos de un mismo formato
+    fusionable salen como {"type": "BATCH", "msgs": [...]}, incrustando los
+    payloads ya codificados vía msgspec.Raw (sin re-codificar). Los "frame"
+    (ya prefijados/comprimidos) pasan siempre intactos. El cliente recorre
+    msgs al ver type == BATCH.
+    """
+    frames = []
+    i = 0
+    while i < len(batch):
+        fmt, payload = batch[i]
+        j = i + 1
+        if fmt != "frame":
+            while j < len(batch) and batch[j][0] == fmt:
+                j += 1
+        if j - i == 1:
+            frames.append(payload)
+        else:
+            encoder = _ENC if fmt == "json" else _MP_ENC
+            frames.append(encoder.encode({
+                "type": "BATCH",
+                "msgs": [msgspec.Raw(p) for _, p in batch[i:j]]
+            }))
+        i = j
+    return frames
+
 # ================= CONFIGURACIÓN =================
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,40 +93,78 @@ except Exception as e:
     logger.warning(f"[⚠️] Firebase no disponible (modo desarrollo): {e}")
 
 # ================= ESTRUCTURAS DE DATOS =================
-@dataclass
-class Player:
-    """Representa un jugador conectado"""
+class PlayerState(msgspec.Struct):
+    """Estado de un jugador tal como viaja por el protocolo.
+
+    Es un msgspec.Struct con los nombres de campo ya en formato de wire: los
+    codificadores lo serializan a nivel C recorriendo sus slots, sin construir
+    nunca el dict intermedio que armaba Player.to_dict().
+    """
     uid: str
     name: str
-    avatar_idx: int
+    avatarIdx: int
     x: float = 0.0
     y: float = 0.0
     hp: int = 100
     score: int = 0
     angle: float = 0.0
-    has_helmet: bool = False
-    on_motorcycle: bool = False
-    is_invisible: bool = False
-    last_update: datetime = None
+    # Bitfield: bit 0 casco, bit 1 moto, bit 2 invisible. Tres booleanos
+    # sueltos costaban ~30 bytes por jugador por broadcast; un int, dos.
+    flags: int = 0
+
+
+class RoomState(msgspec.Struct):
+    """Snapshot de una sala para ROOM_UPDATE / WELCOME"""
+    roomId: str
+    playerCount: int
+    zombieCount: int
+    botCount: int
+    players: list
+    createdAt: str
+
+
+class PlayerUpdate(msgspec.Struct):
+    """Campos (todos opcionales) que puede traer un PLAYER_UPDATE del cliente.
+
+    msgspec lo valida y materializa en C en una sola pasada, en lugar de una
+    cadena de dict.get por campo en el camino más caliente del servidor.
+    """
+    x: Optional[float] = None
+    y: Optional[float] = None
+    hp: Optional[int] = None
+    score: Optional[int] = None
+    angle: Optional[float] = None
+    flags: Optional[int] = None
+
+
+@dataclass(slots=True)
+class Player:
+    """Representa un jugador conectado (estado de wire + lado servidor)"""
+    uid: str
+    name: str
+    avatar_idx: int
+    # Última actividad, en reloj monotónico (solo se usa para intervalos;
+    # inmune a saltos del reloj de pared y sin aritmética de timedelta)
+    last_update: float = 0.0
     ws_connection: Any = None
     is_guest: bool = False
-    
-    def to_dict(self):
-        return {
-            "uid": self.uid,
-            "name": self.name,
-            "avatarIdx": self.avatar_idx,
-            "x": self.x,
-            "y": self.y,
-            "hp": self.hp,
-            "score": self.score,
-            "angle": self.angle,
-            "hasHelmet": self.has_helmet,
-            "onMotorcycle": self.on_motorcycle,
-            "isInvisible": self.is_invisible
-        }
+    # Estado que viaja por el protocolo (se serializa directo, sin dicts)
+    state: PlayerState = None
+    # Claves del protocolo que cambiaron desde el último broadcast
+    _dirty: set = field(default_factory=set)
+    # Cola de salida y tarea que la drena (se crean al entrar a la sala)
+    out_queue: Any = None
+    relay_task: Any = None
+
+    def __post_init__(self):
+        if self.state is None:
+            self.state = PlayerState(
+                uid=self.uid,
+                name=self.name,
+                avatarIdx=self.avatar_idx
+            )
 
-@dataclass
+@dataclass(slots=True)
 class Room:
     """Sala de juego multijugador"""
     id: str
@@ -66,6 +173,9 @@ class Room:
     created_at: datetime = None
     zombie_count: int = 10
     bot_count: int = 10
+    # Tupla cacheada de jugadores: se reconstruye solo al entrar/salir alguien
+    # y es lo que iteran los caminos calientes (broadcasts), sin copiar listas
+    _player_tuple: tuple = ()
     
     def __post_init__(self):
         if self.created_at is None:
@@ -74,24 +184,26 @@ class Room:
     def add_player(self, player: Player):
         if len(self.players) < self.max_players:
             self.players[player.uid] = player
+            self._player_tuple = tuple(self.players.values())
             return True
         return False
     
     def remove_player(self, uid: str):
         if uid in self.players:
             del self.players[uid]
+            self._player_tuple = tuple(self.players.values())
             return True
         return False
     
     def get_state(self):
-        return {
-            "roomId": self.id,
-            "playerCount": len(self.players),
-            "zombieCount": self.zombie_count,
-            "botCount": self.bot_count,
-            "players": [p.to_dict() for p in self.players.values()],
-            "createdAt": self.created_at.isoformat()
-        }
+        return RoomState(
+            roomId=self.id,
+            playerCount=len(self.players),
+            zombieCount=self.zombie_count,
+            botCount=self.bot_count,
+            players=[p.state for p in self._player_tuple],
+            createdAt=self.created_at.isoformat()
+        )
 
 class GameServer:
     """Servidor principal del juego"""
@@ -111,8 +223,45 @@ class GameServer:
         # Configuración del juego
         self.max_zombies_per_room = 100
         self.bot_spawn_rate = 30  # segundos
-        self.last_bot_spawn = datetime.now()
+        self.inactivity_timeout = 60  # segundos
+        self.broadcast_hz = 10  # ticks de broadcast por segundo
+        self.last_bot_spawn = time.monotonic()
+        self.last_stats_log = time.monotonic()
+
+        # Heap de (deadline monotónico, uid) para expirar inactivos sin
+        # recorrer toda la sala en cada pasada; las entradas viejas se
+        # descartan o reprograman al salir del tope del heap
+        self._expiry = []
+
+        # Bajas acumuladas desde el último broadcast (nombre -> cantidad);
+        # viajan agregadas en el próximo broadcast en vez de un chat por kill
+        self._pending_kills: Dict[str, int] = {}
+
+        # Buffer reutilizable para codificar broadcasts: encode_into escribe
+        # sobre el mismo bytearray tick a tick en vez de estrenar uno cada vez
+        self._bcast_buf = bytearray(4096)
+
+        # Pool propio para verificar tokens de Firebase (RSA + posible red):
+        # bloquearía el event loop y no queremos pisar el executor por defecto
+        self._auth_executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="firebase-auth"
+        )
+
+        # Broadcast incremental: cada K ticks se manda un snapshot completo
+        # para resincronizar; el resto son deltas con los campos que cambiaron
+        self.snapshot_every = 10
+        self._ticks_since_snapshot = 0
+
+        # Timestamp ISO cacheado del tick actual: isoformat() no es gratis y
+        # aparece en casi todos los payloads, así que se calcula una vez por
+        # tick y se reutiliza (ver _tick_now)
+        self._now_iso = datetime.now().isoformat()
     
+    def _tick_now(self):
+        """Refresca y devuelve el timestamp ISO cacheado del tick actual"""
+        self._now_iso = datetime.now().isoformat()
+        return self._now_iso
+
     def get_stats(self):
         return {
             "totalConnections": self.total_connections,
@@ -121,13 +270,13 @@ class GameServer:
             "activeRooms": len(self.rooms),
             "totalZombiesKilled": self.total_zombies_killed,
             "activeBots": self.total_bots_spawned,
-            "serverTime": datetime.now().isoformat()
+            "serverTime": self._now_iso
         }
     
     async def spawn_bots(self):
         """Genera bots automáticamente"""
-        now = datetime.now()
-        if (now - self.last_bot_spawn).seconds >= self.bot_spawn_rate:
+        now = time.monotonic()
+        if now - self.last_bot_spawn >= self.bot_spawn_rate:
             self.total_bots_spawned += 5
             self.last_bot_spawn = now
             
@@ -139,52 +288,106 @@ class GameServer:
                         room.zombie_count + 2
                     )
     
-    async def broadcast_room_state(self, room: Room):
-        """Envía el estado actual de la sala a todos sus jugadores"""
-        room_state = room.get_state()
-        server_stats = self.get_stats()
-        
-        broadcast_data = {
-            "type": "ROOM_UPDATE",
-            "roomState": room_state,
-            "serverStats": server_stats,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        tasks = []
-        for player in room.players.values():
-            if player.ws_connection:
-                try:
-                    tasks.append(
-                        player.ws_connection.send(json.dumps(broadcast_data))
-                    )
-                except:
-                    continue
-        
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
-    
-    async def broadcast_chat(self, room: Room, message: str, sender: str = "System"):
+    async def _relay(self, player: Player):
+        """Tarea dedicada por jugador: drena su cola de salida hacia el socket"""
+        try:
+            while True:
+                # Drenar todo lo pendiente y fusionar en la menor cantidad de
+                # frames posible (menos llamadas a send, menos flushes)
+                batch = [await player.out_queue.get()]
+                while not player.out_queue.empty():
+                    batch.append(player.out_queue.get_nowait())
+
+                for payload in _coalesce(batch):
+                    await player.ws_connection.send(payload)
+        except (asyncio.CancelledError, websockets.exceptions.ConnectionClosed):
+            pass
+
+    def _enqueue(self, player: Player, item):
+        """Encola (formato, payload) para un jugador, descartando lo viejo si rebalsa"""
+        try:
+            player.out_queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Cliente lento: descartar el mensaje más viejo y seguir
+            try:
+                player.out_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            player.out_queue.put_nowait(item)
+
+    def _enqueue_all(self, room: Room, payload, fmt: str = "frame"):
+        """Encola el mismo payload para todos los jugadores de la sala"""
+        item = (fmt, payload)
+        for player in room._player_tuple:
+            if player.out_queue is not None:
+                self._enqueue(player, item)
+
+    def broadcast_room_state(self, room: Room, full: bool = False):
+        """Envía el estado de la sala: deltas por defecto, snapshot cada K ticks"""
+        now_iso = self._tick_now()
+        self._ticks_since_snapshot += 1
+
+        if full or self._ticks_since_snapshot >= self.snapshot_every:
+            # Snapshot completo (entrada/salida de jugadores o resincronización)
+            self._ticks_since_snapshot = 0
+            broadcast_data = {
+                "type": "ROOM_UPDATE",
+                "roomState": room.get_state(),
+                "serverStats": self.get_stats(),
+                "timestamp": now_iso
+            }
+            for player in room._player_tuple:
+                player._dirty.clear()
+        else:
+            # Delta: solo los campos que cambiaron desde el último broadcast
+            changes = {}
+            for player in room._player_tuple:
+                if player._dirty:
+                    changes[player.uid] = {
+                        key: getattr(player.state, key)
+                        for key in player._dirty
+                    }
+                    player._dirty.clear()
+
+            broadcast_data = {
+                "type": "ROOM_DELTA",
+                "changes": changes,
+                "timestamp": now_iso
+            }
+
+            # Tick sin novedades: no hay nada que mandar
+            if not changes and not self._pending_kills:
+                return
+
+        # Bajas acumuladas desde el último broadcast, si las hubo
+        if self._pending_kills:
+            broadcast_data["kills"] = self._pending_kills
+            self._pending_kills = {}
+
+        # Serializar sobre el buffer reutilizable (dejando el byte 0 para el
+        # prefijo de formato) y, si amortiza, comprimir una sola vez; los
+        # mismos bytes se encolan para todos los clientes
+        buf = self._bcast_buf
+        _MP_ENC.encode_into(broadcast_data, buf, 1)
+        if len(buf) - 1 >= COMPRESS_MIN_SIZE:
+            payload = FRAME_DEFLATE + zlib.compress(memoryview(buf)[1:], 1)
+        else:
+            buf[0:1] = FRAME_RAW
+            payload = bytes(buf)
+        self._enqueue_all(room, payload)
+
+    def broadcast_chat(self, room: Room, message: str, sender: str = "System"):
         """Envía un mensaje de chat a la sala"""
         chat_data = {
             "type": "CHAT_MESSAGE",
             "sender": sender,
             "message": message,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": self._tick_now()
         }
         
-        tasks = []
-        for player in room.players.values():
-            if player.ws_connection:
-                try:
-                    tasks.append(
-                        player.ws_connection.send(json.dumps(chat_data))
-                    )
-                except:
-                    continue
-        
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        # Serializar una sola vez y reutilizar los mismos bytes para cada envío
+        payload = _ENC.encode(chat_data)
+        self._enqueue_all(room, payload, fmt="json")
     
     async def handle_player_join(self, websocket, data: Dict):
         """Maneja la conexión de un nuevo jugador"""
@@ -197,10 +400,13 @@ class GameServer:
             avatar_idx = player_data.get("avatarIdx", 0)
             is_guest = player_data.get("isGuest", True)
             
-            # Verificar token de Firebase si no es invitado
+            # Verificar token de Firebase si no es invitado (en un hilo:
+            # la verificación es síncrona y tardaría decenas de ms en el loop)
             if firebase_token and not is_guest:
                 try:
-                    decoded_token = auth.verify_id_token(firebase_token)
+                    decoded_token = await asyncio.get_running_loop().run_in_executor(
+                        self._auth_executor, auth.verify_id_token, firebase_token
+                    )
                     uid = decoded_token["uid"]
                     name = decoded_token.get("name", name)
                     is_guest = False
@@ -214,11 +420,21 @@ class GameServer:
                 avatar_idx=avatar_idx,
                 ws_connection=websocket,
                 is_guest=is_guest,
-                last_update=datetime.now()
+                last_update=time.monotonic()
             )
             
             # Añadir a la sala principal
             if self.main_room.add_player(player):
+                # Cola de salida propia + tarea que la drena: un cliente lento
+                # solo se atrasa a sí mismo
+                player.out_queue = asyncio.Queue(maxsize=OUT_QUEUE_SIZE)
+                player.relay_task = asyncio.create_task(self._relay(player))
+
+                heapq.heappush(
+                    self._expiry,
+                    (player.last_update + self.inactivity_timeout, player.uid)
+                )
+
                 self.total_connections += 1
                 self.current_players += 1
                 self.peak_players = max(self.peak_players, self.current_players)
@@ -228,27 +444,27 @@ class GameServer:
                 # Enviar bienvenida
                 welcome_data = {
                     "type": "WELCOME",
-                    "player": player.to_dict(),
+                    "player": player.state,
                     "roomState": self.main_room.get_state(),
                     "serverStats": self.get_stats(),
                     "message": f"Bienvenido a Zombie Survivor, {name}!"
                 }
                 
-                await websocket.send(json.dumps(welcome_data))
+                await websocket.send(_ENC.encode(welcome_data))
                 
                 # Notificar a otros jugadores
-                await self.broadcast_chat(
+                self.broadcast_chat(
                     self.main_room,
                     f"🎮 {name} se unió al juego",
                     "System"
                 )
                 
-                # Broadcast del nuevo estado
-                await self.broadcast_room_state(self.main_room)
+                # Broadcast del nuevo estado (snapshot: hay un jugador nuevo)
+                self.broadcast_room_state(self.main_room, full=True)
                 
                 return player
             else:
-                await websocket.send(json.dumps({
+                await websocket.send(_ENC.encode({
                     "type": "ERROR",
                     "message": "La sala está llena"
                 }))
@@ -256,7 +472,7 @@ class GameServer:
                 
         except Exception as e:
             logger.error(f"Error en player_join: {e}")
-            await websocket.send(json.dumps({
+            await websocket.send(_ENC.encode({
                 "type": "ERROR",
                 "message": "Error interno del servidor"
             }))
@@ -265,34 +481,21 @@ class GameServer:
     async def handle_player_update(self, player: Player, data: Dict):
         """Actualiza la posición/estado de un jugador"""
         try:
-            update_data = data.get("player", {})
-            
-            # Actualizar datos del jugador
-            player.x = update_data.get("x", player.x)
-            player.y = update_data.get("y", player.y)
-            player.hp = update_data.get("hp", player.hp)
-            player.score = update_data.get("score", player.score)
-            player.angle = update_data.get("angle", player.angle)
-            player.has_helmet = update_data.get("hasHelmet", player.has_helmet)
-            player.on_motorcycle = update_data.get("onMotorcycle", player.on_motorcycle)
-            player.is_invisible = update_data.get("isInvisible", player.is_invisible)
-            player.last_update = datetime.now()
-            
-            # Broadcast periódico (cada 2 segundos)
-            now = datetime.now()
-            if hasattr(player, 'last_broadcast'):
-                if (now - player.last_broadcast).seconds >= 2:
-                    await self.broadcast_room_state(self.main_room)
-                    player.last_broadcast = now
-            else:
-                player.last_broadcast = now
-            
-            # Confirmación al jugador
-            await player.ws_connection.send(json.dumps({
-                "type": "UPDATE_ACK",
-                "timestamp": now.isoformat(),
-                "onlinePlayers": self.current_players
-            }))
+            update = msgspec.convert(
+                data.get("player", {}), PlayerUpdate, strict=False
+            )
+
+            # Actualizar solo los campos que realmente cambiaron y marcarlos
+            # como sucios para el próximo ROOM_DELTA
+            state = player.state
+            for key in _WIRE_FIELDS:
+                value = getattr(update, key)
+                if value is not None and value != getattr(state, key):
+                    setattr(state, key, value)
+                    player._dirty.add(key)
+            # Solo correr la marca de actividad; el heap se reprograma al
+            # expirar la entrada vieja, sin un push por cada update
+            player.last_update = time.monotonic()
             
         except Exception as e:
             logger.error(f"Error en player_update: {e}")
@@ -302,7 +505,7 @@ class GameServer:
         try:
             message = data.get("message", "").strip()
             if message and len(message) <= 200:
-                await self.broadcast_chat(
+                self.broadcast_chat(
                     self.main_room,
                     message,
                     player.name
@@ -317,27 +520,26 @@ class GameServer:
             
             if event_type == "ZOMBIE_KILLED":
                 self.total_zombies_killed += 1
-                
-                # Notificar a todos (opcional)
-                await self.broadcast_chat(
-                    self.main_room,
-                    f"☠️ {player.name} eliminó un zombie",
-                    "System"
-                )
-                
+
+                # Acumular para el próximo broadcast: un chat por kill sería
+                # un mensaje a toda la sala por cada zombie que cae
+                kills = self._pending_kills
+                kills[player.name] = kills.get(player.name, 0) + 1
+
             elif event_type == "PLAYER_HIT":
                 damage = data.get("damage", 0)
                 target_id = data.get("targetId")
-                
-                # Buscar jugador objetivo
+
+                # Resolver el golpe con un único acceso al dict; el nuevo HP
+                # viaja en el próximo ROOM_DELTA
                 target = self.main_room.players.get(target_id)
-                if target:
-                    # En un juego real, aquí actualizarías el HP del objetivo
-                    pass
+                if target and damage:
+                    target.state.hp = max(0, target.state.hp - damage)
+                    target._dirty.add("hp")
                     
             elif event_type == "ITEM_PICKED":
                 item_type = data.get("itemType")
-                await self.broadcast_chat(
+                self.broadcast_chat(
                     self.main_room,
                     f"🎁 {player.name} consiguió {item_type}",
                     "System"
@@ -351,19 +553,21 @@ class GameServer:
         try:
             if player.uid in self.main_room.players:
                 self.main_room.remove_player(player.uid)
+                if player.relay_task:
+                    player.relay_task.cancel()
                 self.current_players = max(0, self.current_players - 1)
                 
                 logger.info(f"[👋] {player.name} dejó el juego")
                 
                 # Notificar a otros jugadores
-                await self.broadcast_chat(
+                self.broadcast_chat(
                     self.main_room,
                     f"🚪 {player.name} dejó la partida",
                     "System"
                 )
                 
-                # Actualizar estado de la sala
-                await self.broadcast_room_state(self.main_room)
+                # Actualizar estado de la sala (snapshot: se fue un jugador)
+                self.broadcast_room_state(self.main_room, full=True)
                 
         except Exception as e:
             logger.error(f"Error en desconexión: {e}")
@@ -375,7 +579,11 @@ class GameServer:
         try:
             async for message in websocket:
                 try:
-                    data = json.loads(message)
+                    # Frames binarios llegan en MessagePack, frames de texto en JSON
+                    if isinstance(message, bytes):
+                        data = _MP_DEC.decode(message)
+                    else:
+                        data = _DEC.decode(message)
                     message_type = data.get("type")
                     
                     if message_type == "PLAYER_JOIN":
@@ -391,13 +599,13 @@ class GameServer:
                         await self.handle_game_event(player, data)
                         
                     elif message_type == "PING":
-                        await websocket.send(json.dumps({
+                        await websocket.send(_ENC.encode({
                             "type": "PONG",
-                            "timestamp": datetime.now().isoformat()
+                            "timestamp": self._tick_now()
                         }))
                         
-                except json.JSONDecodeError:
-                    await websocket.send(json.dumps({
+                except msgspec.DecodeError:
+                    await websocket.send(_ENC.encode({
                         "type": "ERROR",
                         "message": "Mensaje JSON inválido"
                     }))
@@ -411,38 +619,51 @@ class GameServer:
             if player:
                 await self.handle_disconnection(player)
     
+    async def broadcast_loop(self):
+        """Único broadcaster de la sala, a cadencia fija.
+
+        Los PLAYER_UPDATE solo mutan estado y marcan campos sucios; acá se
+        coalesce todo eso en un broadcast por tick (deltas vacíos ni se
+        mandan), en vez de un broadcast por jugador activo cada 2s.
+        """
+        interval = 1.0 / self.broadcast_hz
+        while True:
+            try:
+                await asyncio.sleep(interval)
+                if self.main_room.players:
+                    self.broadcast_room_state(self.main_room)
+            except Exception as e:
+                logger.error(f"Error en broadcast_loop: {e}")
+
     async def background_tasks(self):
         """Tareas en segundo plano del servidor"""
         while True:
             try:
+                self._tick_now()
+
                 # Spawn de bots
                 await self.spawn_bots()
                 
-                # Limpieza de jugadores inactivos
-                now = datetime.now()
-                inactive_players = []
-                
-                for player in list(self.main_room.players.values()):
-                    if player.last_update and (now - player.last_update).seconds > 60:
-                        inactive_players.append(player.uid)
-                
-                for uid in inactive_players:
+                # Limpieza de jugadores inactivos: solo se mira el tope del
+                # heap, O(k) en los que realmente expiran en esta pasada
+                now_mono = time.monotonic()
+                while self._expiry and self._expiry[0][0] <= now_mono:
+                    _, uid = heapq.heappop(self._expiry)
                     player = self.main_room.players.get(uid)
-                    if player:
+                    if player is None:
+                        continue  # ya se había desconectado
+                    deadline = player.last_update + self.inactivity_timeout
+                    if deadline > now_mono:
+                        # Entrada vieja: siguió activo, reprogramar su deadline
+                        heapq.heappush(self._expiry, (deadline, uid))
+                    else:
                         await self.handle_disconnection(player)
                 
-                # Broadcast periódico del estado
-                if self.main_room.players:
-                    await self.broadcast_room_state(self.main_room)
-                
                 # Log de estadísticas
-                if hasattr(self, 'last_stats_log'):
-                    if (now - self.last_stats_log).seconds >= 30:
-                        stats = self.get_stats()
-                        logger.info(f"[📊] Estadísticas: {stats}")
-                        self.last_stats_log = now
-                else:
-                    self.last_stats_log = now
+                if now_mono - self.last_stats_log >= 30:
+                    stats = self.get_stats()
+                    logger.info(f"[📊] Estadísticas: {stats}")
+                    self.last_stats_log = now_mono
                 
                 await asyncio.sleep(5)
                 
@@ -456,6 +677,7 @@ async def main():
     
     # Iniciar tareas en segundo plano
     asyncio.create_task(server.background_tasks())
+    asyncio.create_task(server.broadcast_loop())
     
     # Configurar WebSocket
     PORT = 8765
@@ -471,7 +693,10 @@ async def main():
         PORT,
         ping_interval=30,
         ping_timeout=60,
-        close_timeout=10
+        close_timeout=10,
+        # Sin permessage-deflate: los broadcasts ya viajan comprimidos una
+        # sola vez para toda la sala (ver broadcast_room_state)
+        compression=None
     ):
         logger.info("[✅] Servidor listo para conexiones")
         
@@ -479,6 +704,15 @@ async def main():
         await asyncio.Future()
 
 if __name__ == "__main__":
+    # uvloop (libuv) reemplaza el event loop de asyncio por uno en C: misma
+    # API, mucho más throughput en sockets y tareas. Opcional, como Firebase.
+    try:
+        import uvloop
+        uvloop.install()
+        logger.info("[⚡] uvloop activo como event loop")
+    except ImportError:
+        logger.warning("[⚠️] uvloop no disponible, usando asyncio estándar")
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt: